@@ -3,8 +3,12 @@ from typing import Any, AsyncGenerator, Generator, Iterable, List, Optional, Tup
 from pydantic import BaseModel, Field, create_model
 
 from instructor.function_calls import OpenAISchema
-from instructor.mode import Mode
-from instructor.utils import extract_json_from_stream, extract_json_from_stream_async
+from instructor.mode import Mode, warn_mode_functions_deprecation
+from instructor.utils import (
+    extract_json_from_stream,
+    extract_json_from_stream_async,
+    get_stream_extractor,
+)
 
 
 class IterableBase:
@@ -14,6 +18,9 @@ class IterableBase:
     def from_streaming_response(
         cls, completion: Iterable[Any], mode: Mode, **kwargs: Any
     ) -> Generator[BaseModel, None, None]:  # noqa: ARG003
+        if mode is Mode.FUNCTIONS:
+            warn_mode_functions_deprecation()
+
         json_chunks = cls.extract_json(completion, mode)
 
         if mode == Mode.MD_JSON:
@@ -25,6 +32,9 @@ class IterableBase:
     async def from_streaming_response_async(
         cls, completion: AsyncGenerator[Any, None], mode: Mode, **kwargs: Any
     ) -> AsyncGenerator[BaseModel, None]:
+        if mode is Mode.FUNCTIONS:
+            warn_mode_functions_deprecation()
+
         json_chunks = cls.extract_json_async(completion, mode)
 
         if mode == Mode.MD_JSON:
@@ -76,47 +86,33 @@ class IterableBase:
     def extract_json(
         completion: Iterable[Any], mode: Mode
     ) -> Generator[str, None, None]:
+        extractor = get_stream_extractor(mode)
         for chunk in completion:
-            try:
-                if chunk.choices:
-                    if mode == Mode.FUNCTIONS:
-                        if json_chunk := chunk.choices[0].delta.function_call.arguments:
-                            yield json_chunk
-                    elif mode in {Mode.JSON, Mode.MD_JSON, Mode.JSON_SCHEMA, Mode.PARSED_UNGUIDED_JSON}:
-                        if json_chunk := chunk.choices[0].delta.content:
-                            yield json_chunk
-                    elif mode == Mode.TOOLS:
-                        if json_chunk := chunk.choices[0].delta.tool_calls:
-                            yield json_chunk[0].function.arguments
-                    else:
-                        raise NotImplementedError(
-                            f"Mode {mode} is not supported for MultiTask streaming"
-                        )
-            except AttributeError:
-                pass
+            choices = chunk.choices
+            if not choices:
+                continue
+            delta = choices[0].delta
+            # Chunks without a delta, e.g. content-filter results, carry no json
+            if delta is None:
+                continue
+            if json_chunk := extractor(delta):
+                yield json_chunk
 
     @staticmethod
     async def extract_json_async(
         completion: AsyncGenerator[Any, None], mode: Mode
     ) -> AsyncGenerator[str, None]:
+        extractor = get_stream_extractor(mode)
         async for chunk in completion:
-            try:
-                if chunk.choices:
-                    if mode == Mode.FUNCTIONS:
-                        if json_chunk := chunk.choices[0].delta.function_call.arguments:
-                            yield json_chunk
-                    elif mode in {Mode.JSON, Mode.MD_JSON, Mode.JSON_SCHEMA, Mode.PARSED_UNGUIDED_JSON}:
-                        if json_chunk := chunk.choices[0].delta.content:
-                            yield json_chunk
-                    elif mode == Mode.TOOLS:
-                        if json_chunk := chunk.choices[0].delta.tool_calls:
-                            yield json_chunk[0].function.arguments
-                    else:
-                        raise NotImplementedError(
-                            f"Mode {mode} is not supported for MultiTask streaming"
-                        )
-            except AttributeError:
-                pass
+            choices = chunk.choices
+            if not choices:
+                continue
+            delta = choices[0].delta
+            # Chunks without a delta, e.g. content-filter results, carry no json
+            if delta is None:
+                continue
+            if json_chunk := extractor(delta):
+                yield json_chunk
 
     @staticmethod
     def get_object(s: str, stack: int) -> Tuple[Optional[str], str]:
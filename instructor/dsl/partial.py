@@ -19,22 +19,35 @@ from typing import (
     NoReturn,
     Optional,
     TypeVar,
+    cast,
+)
+from copy import copy
+from functools import lru_cache
+import os
+
+from instructor.mode import Mode, warn_mode_functions_deprecation
+from instructor.dsl.partialjson import StreamingJSONParser
+from instructor.utils import (
+    batch_available_async,
+    extract_json_from_stream,
+    extract_json_from_stream_async,
+    get_stream_extractor,
 )
-from copy import deepcopy
-
-from instructor.mode import Mode
-from instructor.dsl.partialjson import JSONParser
-from instructor.utils import extract_json_from_stream, extract_json_from_stream_async
 
-parser = JSONParser()
 T_Model = TypeVar("T_Model", bound=BaseModel)
 
+# Set INSTRUCTOR_DEBUG_CHUNKS=1 to attach the raw chunk to each streamed partial
+_DEBUG_CHUNKS = os.environ.get("INSTRUCTOR_DEBUG_CHUNKS") == "1"
+
 
 class PartialBase(Generic[T_Model]):
     @classmethod
     def from_streaming_response(
         cls, completion: Iterable[Any], mode: Mode, **kwargs: Any
     ) -> Generator[T_Model, None, None]:
+        if mode is Mode.FUNCTIONS:
+            warn_mode_functions_deprecation()
+
         json_chunks = cls.extract_json(completion, mode)
 
         if mode == Mode.MD_JSON:
@@ -46,6 +59,9 @@ class PartialBase(Generic[T_Model]):
     async def from_streaming_response_async(
         cls, completion: AsyncGenerator[Any, None], mode: Mode, **kwargs: Any
     ) -> AsyncGenerator[T_Model, None]:
+        if mode is Mode.FUNCTIONS:
+            warn_mode_functions_deprecation()
+
         json_chunks = cls.extract_json_async(completion, mode)
 
         if mode == Mode.MD_JSON:
@@ -57,91 +73,78 @@ class PartialBase(Generic[T_Model]):
     def model_from_chunks(
         cls, json_chunks: Iterable[Any], **kwargs: Any
     ) -> Generator[T_Model, None, None]:
-        prev_obj = None
-        potential_object = ""
+        stream_parser = StreamingJSONParser()
         for chunk in json_chunks:
-            potential_object += chunk
-
-            # Avoid parsing incomplete json when its just whitespace otherwise parser throws an exception
-            task_json = (
-                parser.parse(potential_object) if potential_object.strip() else None
-            )
-            if task_json:
+            last_revision = stream_parser.revision
+            task_json = stream_parser.feed(chunk)
+            # The revision only changes when the chunk wrote a value, so it
+            # stands in for comparing consecutive objects: unchanged chunks
+            # skip validation and are never yielded twice
+            if task_json and stream_parser.revision != last_revision:
+                # Intermediate partials are validated too: model_construct is
+                # pure Python and measured slower than pydantic-core for these
+                # all-optional models, and it would not build the nested
+                # Partial models, leaving plain dicts in their place
                 obj = cls.model_validate(task_json, strict=None, **kwargs)  # type: ignore[attr-defined]
-                if obj != prev_obj:
+                if _DEBUG_CHUNKS:
                     obj.__dict__[
                         "chunk"
                     ] = chunk  # Provide the raw chunk for debugging and benchmarking
-                    prev_obj = obj
-                    yield obj
+                yield obj
 
     @classmethod
     async def model_from_chunks_async(
         cls, json_chunks: AsyncGenerator[str, None], **kwargs: Any
     ) -> AsyncGenerator[T_Model, None]:
-        potential_object = ""
-        prev_obj = None
-        async for chunk in json_chunks:
-            potential_object += chunk
-
-            # Avoid parsing incomplete json when its just whitespace otherwise parser throws an exception
-            task_json = (
-                parser.parse(potential_object) if potential_object.strip() else None
-            )
-            if task_json:
+        stream_parser = StreamingJSONParser()
+        # Chunks that arrived while the previous partial was being validated
+        # are parsed and validated together
+        async for batch in batch_available_async(json_chunks):
+            chunk = "".join(batch)
+            last_revision = stream_parser.revision
+            task_json = stream_parser.feed(chunk)
+            # The revision only changes when the chunk wrote a value, so it
+            # stands in for comparing consecutive objects: unchanged chunks
+            # skip validation and are never yielded twice
+            if task_json and stream_parser.revision != last_revision:
                 obj = cls.model_validate(task_json, strict=None, **kwargs)  # type: ignore[attr-defined]
-                if obj != prev_obj:
+                if _DEBUG_CHUNKS:
                     obj.__dict__[
                         "chunk"
                     ] = chunk  # Provide the raw chunk for debugging and benchmarking
-                    prev_obj = obj
-                    yield obj
+                yield obj
 
     @staticmethod
     def extract_json(
         completion: Iterable[Any], mode: Mode
     ) -> Generator[str, None, None]:
+        extractor = get_stream_extractor(mode)
         for chunk in completion:
-            try:
-                if chunk.choices:
-                    if mode == Mode.FUNCTIONS:
-                        if json_chunk := chunk.choices[0].delta.function_call.arguments:
-                            yield json_chunk
-                    elif mode in {Mode.JSON, Mode.MD_JSON, Mode.JSON_SCHEMA, Mode.PARSED_UNGUIDED_JSON}:
-                        if json_chunk := chunk.choices[0].delta.content:
-                            yield json_chunk
-                    elif mode == Mode.TOOLS:
-                        if json_chunk := chunk.choices[0].delta.tool_calls:
-                            yield json_chunk[0].function.arguments
-                    else:
-                        raise NotImplementedError(
-                            f"Mode {mode} is not supported for MultiTask streaming"
-                        )
-            except AttributeError:
-                pass
+            choices = chunk.choices
+            if not choices:
+                continue
+            delta = choices[0].delta
+            # Chunks without a delta, e.g. content-filter results, carry no json
+            if delta is None:
+                continue
+            if json_chunk := extractor(delta):
+                yield json_chunk
 
     @staticmethod
     async def extract_json_async(
         completion: AsyncGenerator[Any, None], mode: Mode
     ) -> AsyncGenerator[str, None]:
+        extractor = get_stream_extractor(mode)
         async for chunk in completion:
-            try:
-                if chunk.choices:
-                    if mode == Mode.FUNCTIONS:
-                        if json_chunk := chunk.choices[0].delta.function_call.arguments:
-                            yield json_chunk
-                    elif mode in {Mode.JSON, Mode.MD_JSON, Mode.JSON_SCHEMA, Mode.PARSED_UNGUIDED_JSON}:
-                        if json_chunk := chunk.choices[0].delta.content:
-                            yield json_chunk
-                    elif mode == Mode.TOOLS:
-                        if json_chunk := chunk.choices[0].delta.tool_calls:
-                            yield json_chunk[0].function.arguments
-                    else:
-                        raise NotImplementedError(
-                            f"Mode {mode} is not supported for MultiTask streaming"
-                        )
-            except AttributeError:
-                pass
+            choices = chunk.choices
+            if not choices:
+                continue
+            delta = choices[0].delta
+            # Chunks without a delta, e.g. content-filter results, carry no json
+            if delta is None:
+                continue
+            if json_chunk := extractor(delta):
+                yield json_chunk
 
 
 class Partial(Generic[T_Model]):
@@ -184,49 +187,67 @@ class Partial(Generic[T_Model]):
         wrapped_class: type[T_Model],
     ) -> type[T_Model]:
         """Convert model to a partial model with all fields being optionals."""
-
-        def _make_field_optional(
-            field: FieldInfo,
-        ) -> tuple[object, FieldInfo]:
-            tmp_field = deepcopy(field)
-
-            annotation = field.annotation
-
-            # Handle generics (like List, Dict, etc.)
-            if get_origin(annotation) is not None:
-                # Get the generic base (like List, Dict) and its arguments (like User in List[User])
-                generic_base = get_origin(annotation)
-                generic_args = get_args(annotation)
-
-                # Recursively apply Partial to each of the generic arguments
-                modified_args = tuple(
-                    Partial[arg]  # type: ignore[valid-type]
-                    if isinstance(arg, type) and issubclass(arg, BaseModel)
-                    else arg
-                    for arg in generic_args
-                )
-
-                # Reconstruct the generic type with modified arguments
-                tmp_field.annotation = (
-                    Optional[generic_base[modified_args]] if generic_base else None
-                )
-                tmp_field.default = None
-            # If the field is a BaseModel, then recursively convert it's
-            # attributes to optionals.
-            elif isinstance(annotation, type) and issubclass(annotation, BaseModel):
-                tmp_field.annotation = Optional[Partial[annotation]]  # type: ignore[assignment, valid-type]
-                tmp_field.default = {}
-            else:
-                tmp_field.annotation = Optional[field.annotation]  # type: ignore[assignment]
-                tmp_field.default = None
-            return tmp_field.annotation, tmp_field
-
-        return create_model(
-            __model_name=f"Partial{wrapped_class.__name__}",
-            __base__=(wrapped_class, PartialBase),
-            __module__=wrapped_class.__module__,
-            **{
-                field_name: _make_field_optional(field_info)
-                for field_name, field_info in wrapped_class.__fields__.items()
-            },
-        )  # type: ignore[all]
+        # lru_cache's wrapper only accepts Hashable arguments, which mypy does
+        # not consider model classes to be
+        return _build_partial(cast(Any, wrapped_class))
+
+
+def _is_model_class(obj: Any) -> bool:
+    return isinstance(obj, type) and issubclass(obj, BaseModel)
+
+
+def _make_field_optional(
+    field: FieldInfo,
+) -> tuple[object, FieldInfo]:
+    # Only the annotation and default are changed below, so a shallow copy is
+    # enough; the metadata list and _attributes_set dict get their own copies
+    # as pydantic updates them in place when merging field infos
+    tmp_field = copy(field)
+    tmp_field.metadata = list(field.metadata)
+    tmp_field._attributes_set = dict(field._attributes_set)
+
+    annotation = field.annotation
+
+    # Get the generic base (like List, Dict), or None if the annotation is not generic
+    generic_base = get_origin(annotation)
+
+    # Handle generics (like List, Dict, etc.)
+    if generic_base is not None:
+        # Get its arguments (like User in List[User])
+        generic_args = get_args(annotation)
+
+        # Recursively apply Partial to each of the generic arguments
+        modified_args = tuple(
+            Partial[arg] if _is_model_class(arg) else arg  # type: ignore[valid-type]
+            for arg in generic_args
+        )
+
+        # Reconstruct the generic type with modified arguments
+        tmp_field.annotation = (
+            Optional[generic_base[modified_args]] if generic_base else None
+        )
+        tmp_field.default = None
+    # If the field is a BaseModel, then recursively convert it's
+    # attributes to optionals.
+    elif _is_model_class(annotation):
+        tmp_field.annotation = Optional[Partial[annotation]]  # type: ignore[assignment, valid-type]
+        tmp_field.default = {}
+    else:
+        tmp_field.annotation = Optional[field.annotation]  # type: ignore[assignment]
+        tmp_field.default = None
+    return tmp_field.annotation, tmp_field
+
+
+@lru_cache(maxsize=None)
+def _build_partial(wrapped_class: Any) -> Any:
+    # Cached so that repeated and nested `Partial[...]` lookups of the same
+    # model reuse the class instead of rebuilding its schema every time
+    return create_model(
+        __model_name=f"Partial{wrapped_class.__name__}",
+        __base__=(wrapped_class, PartialBase),
+        __module__=wrapped_class.__module__,
+        **{
+            field_name: _make_field_optional(field_info)
+            for field_name, field_info in wrapped_class.__fields__.items()
+        },
+    )  # type: ignore[all]
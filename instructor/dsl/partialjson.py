@@ -8,8 +8,9 @@ The above copyright notice and this permission notice shall be included in all c
 
 THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, NoReturn, Optional, Tuple
 import json
+import re
 
 
 class JSONParser:
@@ -157,3 +158,339 @@ class JSONParser:
         if s.startswith("null"):
             return None, s[4:]
         raise e
+
+
+_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+_LITERALS = {"t": ("true", True), "f": ("false", False), "n": ("null", None)}
+_NUMBER_CHARS = frozenset("0123456789+-.eE")
+_WHITESPACE = frozenset(" \t\n\r")
+# Runs of characters are consumed with these instead of one at a time in Python.
+# The `*` patterns always match, possibly with an empty run.
+_STRING_SPECIAL = re.compile(r'["\\]')
+_NUMBER_RUN = re.compile(r"[0-9+\-.eE]*")
+_WHITESPACE_RUN = re.compile(r"[ \t\n\r]*")
+
+# Parser states
+_VALUE = 0  # expecting a value (root or after ':')
+_ARRAY_VALUE = 1  # expecting a value or ']' (after '[' or ',')
+_KEY = 2  # expecting a key or '}' (after '{' or ',')
+_COLON = 3
+_AFTER_VALUE = 4  # expecting ',' or the closing bracket of the container
+_STRING = 5
+_ESCAPE = 6
+_UNICODE = 7
+_NUMBER = 8
+_LITERAL = 9
+_DONE = 10
+_BETWEEN_TOKENS = frozenset({_VALUE, _ARRAY_VALUE, _KEY, _COLON, _AFTER_VALUE, _DONE})
+
+
+class _Frame:
+    __slots__ = ("container", "key", "slot_open")
+
+    def __init__(self, container: Any) -> None:
+        self.container = container
+        self.key: Optional[str] = None
+        # Whether the last element of a list frame is still being written
+        self.slot_open = False
+
+
+class StreamingJSONParser:
+    """Incrementally parse a JSON document that arrives in chunks.
+
+    Each call to `feed` only scans the new chunk and returns the best partial
+    value of the whole document so far, so parsing a stream costs O(n) in its
+    total length instead of re-parsing the accumulated buffer on every chunk.
+    Partial values are type stable: object keys only appear once the key is
+    complete (with a `None` value until the value starts), strings grow as
+    they stream in, numbers and literals only appear once they parse, and
+    arrays are only ever appended to. Containers that `feed` has returned are
+    never mutated afterwards: the first write after a `feed` replaces the open
+    containers on the path from the root with shallow copies, so earlier
+    results stay as they were while closed containers are shared.
+
+    `revision` is bumped every time a value is written, so callers can cheaply
+    tell chunks that only carried whitespace, punctuation or a key apart from
+    chunks that produced something new. Completing a key only adds its `None`
+    placeholder and does not bump it.
+
+    A parser holds the state of one document, so each stream needs its own
+    instance; call `reset` to reuse one for the next document.
+    """
+
+    def __init__(self) -> None:
+        self.revision = 0
+        self._stack: List[_Frame] = []
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the current document so the parser can start a new one.
+
+        `revision` keeps counting so that revisions seen before the reset are
+        never reported again for the new document.
+        """
+        self.value: Any = None
+        self._stack.clear()
+        # Whether the open containers were returned by `feed` and must be
+        # copied before the next write
+        self._shared = False
+        self._state = _VALUE
+        self._string_is_key = False
+        self._parts: List[str] = []
+        # Whether `_parts` holds characters that have not been emitted yet
+        self._dirty = False
+        self._unicode: List[str] = []
+        self._literal = ""
+        self._literal_target = ""
+        self._literal_value: Any = None
+
+    def feed(self, chunk: str) -> Optional[Any]:
+        state = self._state
+        if state == _STRING and '"' not in chunk and "\\" not in chunk:
+            # Fast path: most chunks of a long string value only extend it
+            if chunk:
+                self._parts.append(chunk)
+                self._dirty = True
+        elif state in _BETWEEN_TOKENS and (not chunk or chunk.isspace()):
+            # Fast path: whitespace between tokens, common in indented output,
+            # cannot change anything
+            pass
+        else:
+            self._scan(chunk)
+
+        if not self._dirty:
+            pass
+        elif self._state in (_STRING, _ESCAPE, _UNICODE):
+            if not self._string_is_key:
+                value = "".join(self._parts)
+                # Keep the joined prefix so the next join only adds new parts
+                self._parts = [value]
+                self._assign(value)
+        elif self._state == _NUMBER:
+            try:
+                self._assign(self._parse_number(chunk, len(chunk)))
+            except json.JSONDecodeError:
+                pass  # e.g. "-" or "1e", wait for more digits
+        self._shared = True
+        return self.value
+
+    def _scan(self, chunk: str) -> None:
+        i = 0
+        n = len(chunk)
+        while i < n:
+            state = self._state
+            if state == _STRING:
+                # Consume the run of plain characters up to the next quote or
+                # backslash in one go
+                match = _STRING_SPECIAL.search(chunk, i)
+                end = match.start() if match else n
+                if end > i:
+                    self._parts.append(chunk[i:end])
+                    self._dirty = True
+                    i = end
+                    continue
+                if chunk[i] == '"':
+                    self._end_string()
+                else:
+                    self._state = _ESCAPE
+                i += 1
+                continue
+
+            if state == _NUMBER:
+                end = _NUMBER_RUN.match(chunk, i).end()  # type: ignore[union-attr]
+                if end > i:
+                    self._parts.append(chunk[i:end])
+                    self._dirty = True
+                    i = end
+                    continue
+                if self._dirty:
+                    self._assign(self._parse_number(chunk, i))
+                self._end_value()
+                state = self._state
+
+            c = chunk[i]
+            if c in _WHITESPACE and state not in (_ESCAPE, _UNICODE, _LITERAL):
+                i = _WHITESPACE_RUN.match(chunk, i).end()  # type: ignore[union-attr]
+                continue
+            if state == _ESCAPE:
+                if c == "u":
+                    self._state = _UNICODE
+                elif c in _ESCAPES:
+                    self._parts.append(_ESCAPES[c])
+                    self._dirty = True
+                    self._state = _STRING
+                else:
+                    self._error(chunk, i)
+            elif state == _UNICODE:
+                self._unicode.append(c)
+                if len(self._unicode) == 4:
+                    self._end_unicode(chunk, i)
+            elif state == _LITERAL:
+                self._literal += c
+                if not self._literal_target.startswith(self._literal):
+                    self._error(chunk, i)
+                if self._literal == self._literal_target:
+                    self._assign(self._literal_value)
+                    self._end_value()
+            elif state == _DONE:
+                break  # ignore anything after the document
+            else:
+                self._feed_structural(c, chunk, i)
+            i += 1
+
+    def _feed_structural(self, c: str, chunk: str, i: int) -> None:
+        state = self._state
+        if state == _AFTER_VALUE:
+            frame = self._stack[-1]
+            if c == ",":
+                if isinstance(frame.container, list):
+                    frame.slot_open = False
+                    self._state = _ARRAY_VALUE
+                else:
+                    self._state = _KEY
+            elif (c == "]" and isinstance(frame.container, list)) or (
+                c == "}" and isinstance(frame.container, dict)
+            ):
+                self._close_container()
+            else:
+                self._error(chunk, i)
+        elif state == _KEY:
+            if c == '"':
+                self._start_string(is_key=True)
+            elif c == "}":
+                self._close_container()
+            else:
+                self._error(chunk, i)
+        elif state == _COLON:
+            if c != ":":
+                self._error(chunk, i)
+            self._state = _VALUE
+        elif c == "]" and state == _ARRAY_VALUE:
+            self._close_container()
+        elif c == "{":
+            self._open_container({})
+            self._state = _KEY
+        elif c == "[":
+            self._open_container([])
+            self._state = _ARRAY_VALUE
+        elif c == '"':
+            self._start_string(is_key=False)
+        elif c in _NUMBER_CHARS:
+            self._parts = [c]
+            self._dirty = True
+            self._state = _NUMBER
+        elif c in _LITERALS:
+            self._literal = c
+            self._literal_target, self._literal_value = _LITERALS[c]
+            self._state = _LITERAL
+        else:
+            self._error(chunk, i)
+
+    def _unshare(self) -> None:
+        """Replace the open containers with copies before writing to them."""
+        if not self._shared:
+            return
+        self._shared = False
+        parent: Optional[_Frame] = None
+        for frame in self._stack:
+            frame.container = frame.container.copy()
+            if parent is None:
+                self.value = frame.container
+            elif isinstance(parent.container, list):
+                # An open child is always the last element of its list
+                parent.container[-1] = frame.container
+            else:
+                parent.container[parent.key] = frame.container
+            parent = frame
+
+    def _assign(self, value: Any) -> None:
+        self.revision += 1
+        self._dirty = False
+        if not self._stack:
+            self.value = value
+            return
+        self._unshare()
+        frame = self._stack[-1]
+        container = frame.container
+        if isinstance(container, list):
+            if frame.slot_open:
+                container[-1] = value
+            else:
+                container.append(value)
+                frame.slot_open = True
+        else:
+            container[frame.key] = value
+
+    def _open_container(self, container: Any) -> None:
+        self._assign(container)
+        self._stack.append(_Frame(container))
+
+    def _close_container(self) -> None:
+        self._stack.pop()
+        self._end_value()
+
+    def _end_value(self) -> None:
+        self._state = _AFTER_VALUE if self._stack else _DONE
+
+    def _start_string(self, is_key: bool) -> None:
+        self._string_is_key = is_key
+        self._parts = []
+        self._dirty = False
+        self._state = _STRING
+        if not is_key:
+            self._assign("")
+
+    def _end_string(self) -> None:
+        if self._string_is_key:
+            frame = self._stack[-1]
+            frame.key = "".join(self._parts)
+            # A placeholder rather than a value, so the revision is not bumped
+            self._unshare()
+            frame.container[frame.key] = None
+            self._dirty = False
+            self._state = _COLON
+        else:
+            if self._dirty:
+                self._assign("".join(self._parts))
+            self._end_value()
+
+    def _end_unicode(self, chunk: str, i: int) -> None:
+        try:
+            code = int("".join(self._unicode), 16)
+        except ValueError:
+            self._error(chunk, i)
+        self._unicode = []
+        parts = self._parts
+        # Join a UTF-16 surrogate pair that was split over two escapes
+        if (
+            0xDC00 <= code <= 0xDFFF
+            and parts
+            and "\ud800" <= parts[-1][-1:] <= "\udbff"
+        ):
+            high = ord(parts[-1][-1])
+            parts[-1] = parts[-1][:-1]
+            code = 0x10000 + ((high - 0xD800) << 10) + (code - 0xDC00)
+        parts.append(chr(code))
+        self._dirty = True
+        self._state = _STRING
+
+    def _parse_number(self, chunk: str, i: int) -> Any:
+        num_str = "".join(self._parts)
+        try:
+            if "." in num_str or "e" in num_str or "E" in num_str:
+                return float(num_str)
+            return int(num_str)
+        except ValueError:
+            self._error(chunk, i)
+
+    def _error(self, chunk: str, i: int) -> NoReturn:
+        raise json.JSONDecodeError("Unexpected character while streaming", chunk, i)
@@ -1,5 +1,12 @@
 import enum
+import os
+import sys
 import warnings
+from types import FrameType
+from typing import Optional
+
+# Frames from files under this directory are skipped when attributing warnings
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
 
 
 class Mode(enum.Enum):
@@ -15,16 +22,28 @@ class Mode(enum.Enum):
     MD_JSON = "markdown_json_mode"
     JSON_SCHEMA = "json_schema_mode"
 
-    def __new__(cls, value: str) -> "Mode":
-        member = object.__new__(cls)
-        member._value_ = value
 
-        # Deprecation warning for FUNCTIONS
-        if value == "function_call":
-            warnings.warn(
-                "FUNCTIONS is deprecated and will be removed in future versions",
-                DeprecationWarning,
-                stacklevel=2,
-            )
+def _user_stacklevel() -> int:
+    """Return the stacklevel of the first frame outside the instructor package,
+    as seen from the function that calls `warnings.warn`."""
+    frame: Optional[FrameType] = sys._getframe(2)
+    level = 2
+    while frame is not None and frame.f_code.co_filename.startswith(_PACKAGE_DIR):
+        frame = frame.f_back
+        level += 1
+    return level
+
+
+def warn_mode_functions_deprecation() -> None:
+    """Warn that `Mode.FUNCTIONS` is deprecated.
 
-        return member
+    Called from the places that accept a mode rather than from the enum
+    itself, so importing or looking up `Mode` never triggers it. The warning
+    is attributed to the user's code so the default filters show it, and
+    Python's warning registry shows it once per call site.
+    """
+    warnings.warn(
+        "FUNCTIONS is deprecated and will be removed in future versions",
+        DeprecationWarning,
+        stacklevel=_user_stacklevel(),
+    )
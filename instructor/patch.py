@@ -17,7 +17,7 @@ from instructor.process_response import handle_response_model
 from instructor.retry import retry_async, retry_sync
 from instructor.utils import is_async
 
-from instructor.mode import Mode
+from instructor.mode import Mode, warn_mode_functions_deprecation
 import logging
 
 logger = logging.getLogger("instructor")
@@ -81,6 +81,9 @@ def patch(
 
     logger.debug(f"Patching `client.chat.completions.create` with {mode=}")
 
+    if mode is Mode.FUNCTIONS:
+        warn_mode_functions_deprecation()
+
     if create is not None:
         func = create
     elif client is not None:
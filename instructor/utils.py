@@ -1,6 +1,18 @@
+import asyncio
 import inspect
 import json
-from typing import Callable, Generator, Iterable, AsyncGenerator, TypeVar
+from operator import attrgetter
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    TypeVar,
+)
 
 from pydantic import BaseModel
 
@@ -10,7 +22,53 @@ from openai.types.chat import (
     ChatCompletionMessageParam,
 )
 
+from instructor.mode import Mode
+
 T_Model = TypeVar("T_Model", bound=BaseModel)
+T = TypeVar("T")
+
+# Modes whose streamed json arrives as plain message content
+_JSON_CONTENT_MODES = frozenset(
+    {Mode.JSON, Mode.MD_JSON, Mode.JSON_SCHEMA, Mode.PARSED_UNGUIDED_JSON}
+)
+
+
+def _function_call_arguments(delta: Any) -> Optional[str]:
+    function_call = getattr(delta, "function_call", None)
+    return getattr(function_call, "arguments", None)
+
+
+# The extract loops skip chunks whose delta is None, and every ChoiceDelta has
+# a `content` attribute, so the C-implemented attrgetter can serve as the
+# extractor directly
+_content: Callable[[Any], Optional[str]] = attrgetter("content")
+
+
+def _tool_call_arguments(delta: Any) -> Optional[str]:
+    if tool_calls := getattr(delta, "tool_calls", None):
+        function = getattr(tool_calls[0], "function", None)
+        return getattr(function, "arguments", None)
+    return None
+
+
+# Per-mode extractors for the json text carried by the delta of a streamed
+# chunk, looked up once per stream rather than branching on the mode for every
+# chunk. Missing attributes (e.g. the role-only first chunk) give None instead
+# of raising.
+_STREAM_EXTRACTORS: Dict[Mode, Callable[[Any], Optional[str]]] = {
+    Mode.FUNCTIONS: _function_call_arguments,
+    **dict.fromkeys(_JSON_CONTENT_MODES, _content),
+    Mode.TOOLS: _tool_call_arguments,
+}
+
+
+def get_stream_extractor(mode: Mode) -> Callable[[Any], Optional[str]]:
+    try:
+        return _STREAM_EXTRACTORS[mode]
+    except KeyError:
+        raise NotImplementedError(
+            f"Mode {mode} is not supported for MultiTask streaming"
+        ) from None
 
 
 def extract_json_from_codeblock(content: str) -> str:
@@ -59,6 +117,53 @@ async def extract_json_from_stream_async(
                 yield char
 
 
+async def batch_available_async(
+    chunks: AsyncGenerator[T, None],
+    maxsize: int = 16,
+) -> AsyncGenerator[List[T], None]:
+    """Yield lists of the chunks that arrived while the consumer was busy.
+
+    The source is drained by a background task, so a slow consumer gets every
+    chunk that is already available in one batch instead of one per iteration.
+    At most `maxsize` chunks are buffered: once the queue is full the task
+    waits for the consumer, so a consumer that stops iterating without closing
+    the generator does not read the rest of the source. Errors raised by the
+    source are re-raised once the buffered chunks have been yielded.
+    """
+    queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=maxsize)
+    end = object()
+
+    async def drain() -> None:
+        try:
+            async for chunk in chunks:
+                await queue.put(chunk)
+        finally:
+            # Runs for any exit, cancellation included, and must not block: a
+            # full queue has no waiting consumer to wake, and the consumer
+            # checks whether the task is done before waiting again
+            if not queue.full():
+                queue.put_nowait(end)
+
+    producer = asyncio.ensure_future(drain())
+    try:
+        while True:
+            if queue.empty() and producer.done():
+                break
+            batch = [await queue.get()]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            finished = batch[-1] is end
+            if finished:
+                batch.pop()
+            if batch:
+                yield batch
+            if finished:
+                break
+        await producer
+    finally:
+        producer.cancel()
+
+
 def update_total_usage(response: T_Model, total_usage) -> T_Model | ChatCompletion:
     if isinstance(response, ChatCompletion) and response.usage is not None:
         total_usage.completion_tokens += response.usage.completion_tokens or 0
@@ -1,4 +1,6 @@
-from instructor import OpenAISchema
+from openai.types.chat.chat_completion_chunk import ChatCompletionChunk, Choice
+
+from instructor import Mode, OpenAISchema
 from instructor.dsl import IterableModel
 
 
@@ -15,3 +17,15 @@ def test_multi_task():
         IterableSearch.openai_schema["description"]
         == "Correct segmentation of `Search` tasks"
     )
+
+
+def test_extract_json_skips_missing_delta():
+    class Search(OpenAISchema):
+        id: int
+
+    # Azure content-filter chunks have a choice without a delta
+    chunk = ChatCompletionChunk.model_construct(
+        choices=[Choice.model_construct(index=0, delta=None, finish_reason=None)]
+    )
+    IterableSearch = IterableModel(Search)
+    assert list(IterableSearch.extract_json([chunk], Mode.JSON)) == []
@@ -0,0 +1,231 @@
+import json
+import copy
+from typing import Any, Dict, List, get_args
+
+import pytest
+from openai.types.chat.chat_completion_chunk import ChatCompletionChunk, Choice
+from pydantic import BaseModel, Field
+
+from instructor.dsl import partial
+from instructor.dsl.partial import Partial
+from instructor.mode import Mode
+from instructor.dsl.partialjson import StreamingJSONParser
+
+
+class Address(BaseModel):
+    city: str
+
+
+class UserExtract(BaseModel):
+    name: str
+    age: int
+    addresses: List[Address]
+
+
+DOCUMENT = json.dumps(
+    {
+        "name": 'Jason "jxnl" Liu é\U0001f600',
+        "age": 12,
+        "addresses": [{"city": "Toronto"}, {"city": "San Francisco"}],
+        "score": -1.5e3,
+        "flags": [True, False, None],
+    },
+    indent=2,
+)
+
+
+def test_streaming_parser_matches_json_loads():
+    for size in range(1, 8):
+        parser = StreamingJSONParser()
+        for i in range(0, len(DOCUMENT), size):
+            value = parser.feed(DOCUMENT[i : i + size])
+        assert value == json.loads(DOCUMENT)
+
+
+def test_streaming_parser_partial_values():
+    parser = StreamingJSONParser()
+    assert parser.feed("  ") is None
+    assert parser.feed('{"na') == {}
+    assert parser.feed('me": "Ja') == {"name": "Ja"}
+    assert parser.feed('son", "age": 1') == {"name": "Jason", "age": 1}
+    assert parser.feed('2, "tags": ["a", "b') == {
+        "name": "Jason",
+        "age": 12,
+        "tags": ["a", "b"],
+    }
+
+
+def test_streaming_parser_returned_values_are_not_mutated():
+    parser = StreamingJSONParser()
+    snapshots = []
+    for i in range(0, len(DOCUMENT), 2):
+        value = parser.feed(DOCUMENT[i : i + 2])
+        snapshots.append((value, copy.deepcopy(value)))
+    assert all(value == snapshot for value, snapshot in snapshots)
+
+
+def test_streaming_parser_revision():
+    parser = StreamingJSONParser()
+    revisions = []
+    for chunk in ['{"na', 'me"', ': "Ja', "son", '"', ", ", '"age": 1', "2", "}"]:
+        parser.feed(chunk)
+        revisions.append(parser.revision)
+    assert revisions == [1, 1, 3, 4, 4, 4, 5, 6, 6]
+
+
+def test_streaming_parser_reset():
+    parser = StreamingJSONParser()
+    parser.feed('{"name": "Jason", "tags": ["a"')
+    revision = parser.revision
+    parser.reset()
+    assert parser.feed("  ") is None
+    assert parser.feed('["b"]') == ["b"]
+    assert parser.revision > revision
+
+
+def test_streaming_parser_invalid_json():
+    parser = StreamingJSONParser()
+    with pytest.raises(json.JSONDecodeError):
+        parser.feed('{"name" "Jason"}')
+
+
+def test_partial_is_cached():
+    assert Partial[UserExtract] is Partial[UserExtract]
+    assert (
+        Partial[Address]
+        is get_args(
+            get_args(Partial[UserExtract].model_fields["addresses"].annotation)[0]
+        )[0]
+    )
+
+
+def test_partial_does_not_mutate_wrapped_fields():
+    class Wrapped(BaseModel):
+        name: str = Field(description="The name")
+        address: Address
+
+    fields = {name: repr(field) for name, field in Wrapped.model_fields.items()}
+    attributes_set = {
+        name: dict(field._attributes_set)
+        for name, field in Wrapped.model_fields.items()
+    }
+    Partial[Wrapped]
+    assert {
+        name: repr(field) for name, field in Wrapped.model_fields.items()
+    } == fields
+    assert {
+        name: field._attributes_set for name, field in Wrapped.model_fields.items()
+    } == attributes_set
+
+
+def test_model_from_chunks():
+    chunks = [DOCUMENT[i : i + 3] for i in range(0, len(DOCUMENT), 3)]
+    results = list(Partial[UserExtract].model_from_chunks(chunks))
+    assert results[0].name == "Ja"
+    assert results[-1].name == 'Jason "jxnl" Liu é\U0001f600'
+    assert results[-1].age == 12
+    assert [a.city for a in results[-1].addresses] == ["Toronto", "San Francisco"]
+    # Only the undeclared "score" and "flags" keys can leave the object as is
+    complete = results.index(results[-1])
+    assert all(a != b for a, b in zip(results[:complete], results[1 : complete + 1]))
+
+
+def test_model_from_chunks_does_not_mutate_yielded_partials():
+    class Payload(BaseModel):
+        data: Dict[str, Any]
+        extra: Any
+
+    document = '{"data": {"a": [1, 2, 3]}, "extra": {"x": "hello"}}'
+    yielded = []
+    for obj in Partial[Payload].model_from_chunks(document):
+        yielded.append((obj, repr(obj)))
+    assert len(yielded) > 1
+    assert all(repr(obj) == seen for obj, seen in yielded)
+
+
+def test_model_from_chunks_debug_chunks(monkeypatch):
+    chunks = ['{"name": "Jason", ', '"age": 12}']
+    results = list(Partial[UserExtract].model_from_chunks(chunks))
+    assert "chunk" not in results[-1].__dict__
+
+    monkeypatch.setattr(partial, "_DEBUG_CHUNKS", True)
+    results = list(Partial[UserExtract].model_from_chunks(chunks))
+    assert results[-1].chunk == '"age": 12}'
+
+
+@pytest.mark.asyncio
+async def test_model_from_chunks_async():
+    async def chunks():
+        for i in range(0, len(DOCUMENT), 3):
+            yield DOCUMENT[i : i + 3]
+
+    results = [
+        obj async for obj in Partial[UserExtract].model_from_chunks_async(chunks())
+    ]
+    assert results[-1].age == 12
+    assert [a.city for a in results[-1].addresses] == ["Toronto", "San Francisco"]
+
+
+def make_chunk(delta):
+    return ChatCompletionChunk(
+        id="test_id",
+        choices=[{"index": 0, "delta": delta, "finish_reason": None}],
+        created=1234567890,
+        model="gpt-3.5-turbo",
+        object="chat.completion.chunk",
+    )
+
+
+def test_extract_json():
+    tool_call = {
+        "index": 0,
+        "function": {"name": "UserExtract", "arguments": '{"name": '},
+    }
+    completion = [
+        make_chunk({"role": "assistant"}),
+        make_chunk({"tool_calls": [tool_call]}),
+        make_chunk({"content": '"Jason"}'}),
+        ChatCompletionChunk(
+            id="test_id",
+            choices=[],
+            created=1234567890,
+            model="gpt-3.5-turbo",
+            object="chat.completion.chunk",
+        ),
+    ]
+    extract_json = Partial[UserExtract].extract_json
+    assert list(extract_json(completion, Mode.TOOLS)) == ['{"name": ']
+    assert list(extract_json(completion, Mode.JSON)) == ['"Jason"}']
+    assert list(extract_json(completion, Mode.FUNCTIONS)) == []
+    with pytest.warns(DeprecationWarning, match="FUNCTIONS is deprecated") as record:
+        from_streaming_response = Partial[UserExtract].from_streaming_response
+        assert list(from_streaming_response(completion, Mode.FUNCTIONS)) == []
+    assert record[0].filename == __file__
+    with pytest.raises(NotImplementedError):
+        list(extract_json(completion, Mode.PARALLEL_TOOLS))
+
+
+def make_filtered_chunk():
+    # Azure content-filter chunks have a choice without a delta
+    return ChatCompletionChunk.model_construct(
+        choices=[Choice.model_construct(index=0, delta=None, finish_reason=None)]
+    )
+
+
+def test_extract_json_skips_missing_delta():
+    completion = [make_filtered_chunk(), make_chunk({"content": '{"name": "Jason"}'})]
+    extract_json = Partial[UserExtract].extract_json
+    assert list(extract_json(completion, Mode.JSON)) == ['{"name": "Jason"}']
+    assert list(extract_json(completion, Mode.TOOLS)) == []
+
+
+@pytest.mark.asyncio
+async def test_extract_json_async_skips_missing_delta():
+    async def completion():
+        yield make_filtered_chunk()
+        yield make_chunk({"content": '{"name": "Jason"}'})
+
+    extract_json_async = Partial[UserExtract].extract_json_async
+    assert [
+        chunk async for chunk in extract_json_async(completion(), Mode.JSON)
+    ] == ['{"name": "Jason"}']
@@ -1,5 +1,6 @@
 import functools
 
+import pytest
 from openai import AsyncOpenAI, OpenAI
 
 import instructor
@@ -14,6 +15,12 @@ def test_apatch_completes_successfully():
     instructor.apatch(AsyncOpenAI())
 
 
+def test_patch_warns_on_functions_mode():
+    with pytest.warns(DeprecationWarning, match="FUNCTIONS is deprecated") as record:
+        instructor.patch(OpenAI(), mode=instructor.Mode.FUNCTIONS)
+    assert record[0].filename == __file__
+
+
 def test_is_async_returns_true_if_function_is_async():
     async def async_function():
         pass
@@ -1,6 +1,8 @@
+import asyncio
 import json
 import pytest
 from instructor.utils import (
+    batch_available_async,
     extract_json_from_codeblock,
     extract_json_from_stream,
     extract_json_from_stream_async,
@@ -125,3 +127,63 @@ async def test_stream_json_async():
         "key": "value",
         "another_key": [{"key": {"key": "value"}}, {"key": "value"}],
     }
+
+
+@pytest.mark.asyncio
+async def test_batch_available_async():
+    async def chunks():
+        for chunk in ["a", "b", "c"]:
+            yield chunk
+        await asyncio.sleep(0.01)
+        yield "d"
+
+    batches = [batch async for batch in batch_available_async(chunks())]
+    assert batches == [["a", "b", "c"], ["d"]]
+
+
+@pytest.mark.asyncio
+async def test_batch_available_async_raises():
+    async def chunks():
+        yield "a"
+        raise ValueError("stream failed")
+
+    batches = []
+    with pytest.raises(ValueError, match="stream failed"):
+        async for batch in batch_available_async(chunks()):
+            batches.append(batch)
+    assert batches == [["a"]]
+
+
+@pytest.mark.asyncio
+async def test_batch_available_async_early_break():
+    pulled = []
+
+    async def chunks():
+        for i in range(100):
+            pulled.append(i)
+            yield i
+
+    gen = batch_available_async(chunks(), maxsize=4)
+    async for _batch in gen:
+        break
+    await asyncio.sleep(0.01)
+    # The producer stops once the queue is full, even though gen is still open
+    assert len(pulled) <= 10
+    await gen.aclose()
+
+
+@pytest.mark.asyncio
+async def test_batch_available_async_source_cancelled():
+    async def chunks():
+        yield "a"
+        raise asyncio.CancelledError
+
+    async def consume(maxsize):
+        return [
+            batch async for batch in batch_available_async(chunks(), maxsize=maxsize)
+        ]
+
+    # With maxsize=1 the queue is full when the source stops
+    for maxsize in (1, 16):
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(consume(maxsize), timeout=1)